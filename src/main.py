@@ -1,76 +1,131 @@
 import json
+import logging
+import os
 import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 from pdf_parser import PDFParser
 from section_extractor import SectionExtractor
 from persona_matcher import PersonaMatcher
 from output_formatter import OutputFormatter
 
+logger = logging.getLogger(__name__)
+
+# Per-process pipeline components, created once by _init_worker
+_parser: Optional[PDFParser] = None
+_extractor: Optional[SectionExtractor] = None
+
+def _configure_logging():
+    """Log to stderr through one handler; a no-op if logging is already set up."""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+def _init_worker(page_workers: int = 1, max_content_pages: Optional[int] = None):
+    """Build the parser and extractor once per worker process."""
+    global _parser, _extractor
+    _configure_logging()
+    _parser = PDFParser(max_content_pages=max_content_pages, page_workers=page_workers)
+    _extractor = SectionExtractor()
+
+def process_single_pdf(pdf_file: Path) -> Optional[Dict]:
+    """Parse one PDF and extract its sections; runs inside a worker process."""
+    if _parser is None:
+        _init_worker()
+    
+    logger.info("Processing %s...", pdf_file.name)
+    
+    # Parse PDF
+    document_data = _parser.parse(pdf_file)
+    
+    if not document_data["pages"]:
+        logger.warning("No content extracted from %s", pdf_file.name)
+        return None
+    
+    # Extract sections
+    sections = _extractor.extract_sections(document_data)
+    
+    # Sections are ranked across documents, so each keeps a reference to its file name
+    name = pdf_file.name
+    for section in sections:
+        section["document_name"] = name
+    
+    logger.info("✓ Extracted %d sections from %s", len(sections), name)
+    return {
+        "document_name": name,
+        "sections": sections
+    }
+
+def extract_config(config: Dict) -> Tuple[str, str]:
+    """Read persona and job from either the flat or the challenge_info config shape."""
+    persona = config.get("persona", "General Researcher")
+    job_to_be_done = config.get("job_to_be_done", "Extract relevant information")
+    
+    # challenge_info inputs nest these as {"role": ...} and {"task": ...}
+    if isinstance(persona, dict):
+        persona = persona.get("role", "General Researcher")
+    if isinstance(job_to_be_done, dict):
+        job_to_be_done = job_to_be_done.get("task", "Extract relevant information")
+    
+    return persona, job_to_be_done
+
 def main():
+    _configure_logging()
+    
     input_dir = Path("/app/input")
     output_dir = Path("/app/output")
     output_dir.mkdir(exist_ok=True)
     
     # Load configuration
     config_file = input_dir / "config.json"
-    if config_file.exists():
-        with open(config_file, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-    else:
-        config = {}
+    config = json.loads(config_file.read_bytes()) if config_file.exists() else {}
     
-    persona = config.get("persona", "General Researcher")
-    job_to_be_done = config.get("job_to_be_done", "Extract relevant information")
+    persona, job_to_be_done = extract_config(config)
     
-    # Get all PDF files
-    pdf_files = list(input_dir.glob("*.pdf"))[:5]  # Limit to 5 PDFs
-    print(f"Found {len(pdf_files)} PDF files to process")
+    # Get all PDF files, matching the extension case-insensitively and skipping
+    # empty files; a missing input directory simply yields no PDFs
+    pdf_files = []
+    if input_dir.is_dir():
+        with os.scandir(input_dir) as entries:
+            pdf_files = [
+                Path(entry.path) for entry in entries
+                if entry.name.lower().endswith(".pdf") and entry.is_file() and entry.stat().st_size > 0
+            ][:5]  # Limit to 5 PDFs
+    logger.info("Found %d PDF files to process", len(pdf_files))
     
     if not pdf_files:
-        print("No PDF files found!")
+        logger.warning("No PDF files found!")
         return
     
-    # Process all PDFs
+    # Process all PDFs, one worker process per document (parsing is CPU-bound)
     all_sections = []
     processed_docs = []
     start_time = time.time()
     
-    for pdf_file in pdf_files:
-        print(f"Processing {pdf_file.name}...")
-        
-        # Parse PDF
-        parser = PDFParser()
-        document_data = parser.parse(pdf_file)
-        
-        if not document_data["pages"]:
-            print(f"No content extracted from {pdf_file.name}")
-            continue
-        
-        # Extract sections
-        extractor = SectionExtractor()
-        sections = extractor.extract_sections(document_data)
-        
-        # Add document metadata
-        for section in sections:
-            section["document_name"] = pdf_file.name
-            section["document_title"] = document_data["title"]
-        
-        all_sections.extend(sections)
-        processed_docs.append(pdf_file.name)
-        print(f"✓ Extracted {len(sections)} sections from {pdf_file.name}")
+    max_workers = config.get("max_workers") or max(1, (os.cpu_count() or 2) - 1)
+    max_workers = min(max_workers, len(pdf_files))
+    
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(config.get("page_workers", 1),
+                                       config.get("max_content_pages"))) as executor:
+        for result in executor.map(process_single_pdf, pdf_files):
+            if result is None:
+                continue
+            
+            all_sections.extend(result["sections"])
+            processed_docs.append(result["document_name"])
     
-    print(f"Total sections extracted across all PDFs: {len(all_sections)}")
+    logger.info("Total sections extracted across all PDFs: %d", len(all_sections))
     
     if not all_sections:
-        print("No sections extracted from any PDF!")
+        logger.warning("No sections extracted from any PDF!")
         return
     
     # Match sections to persona
-    print("Matching sections to persona...")
+    logger.info("Matching sections to persona...")
     matcher = PersonaMatcher()
     relevant_sections = matcher.match_sections(all_sections, persona, job_to_be_done)
     
-    print(f"Found {len(relevant_sections)} relevant sections")
+    logger.info("Found %d relevant sections", len(relevant_sections))
     
     # Format output
     formatter = OutputFormatter()
@@ -83,30 +138,28 @@ def main():
         # Ensure output directory exists
         output_file.parent.mkdir(parents=True, exist_ok=True)
         
-        # Write with explicit encoding and error handling
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
+        # Serialize in memory and write once; json.dump issues a write per token
+        output_file.write_text(json.dumps(output_data, indent=2, ensure_ascii=False), encoding='utf-8')
         
         # Verify file was written
         if output_file.exists() and output_file.stat().st_size > 0:
-            print(f"✅ Output successfully saved to {output_file}")
-            print(f"📄 File size: {output_file.stat().st_size} bytes")
+            logger.info("✅ Output successfully saved to %s", output_file)
+            logger.info("📄 File size: %d bytes", output_file.stat().st_size)
         else:
-            print(f"❌ Output file creation failed!")
+            logger.error("❌ Output file creation failed!")
             
     except Exception as e:
-        print(f"❌ Error saving output: {str(e)}")
+        logger.error("❌ Error saving output: %s", e)
         
         # Fallback - save to current directory
         try:
-            with open("extracted_sections.json", 'w') as f:
-                json.dump(output_data, f, indent=2)
-            print("✅ Saved to current directory as fallback")
+            Path("extracted_sections.json").write_text(json.dumps(output_data, indent=2))
+            logger.info("✅ Saved to current directory as fallback")
         except Exception as e2:
-            print(f"❌ Fallback save also failed: {str(e2)}")
+            logger.error("❌ Fallback save also failed: %s", e2)
     
     total_time = time.time() - start_time
-    print(f"Processing completed in {total_time:.2f} seconds")
+    logger.info("Processing completed in %.2f seconds", total_time)
 
 if __name__ == "__main__":
     main()
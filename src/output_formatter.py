@@ -1,53 +1,57 @@
-import json
+import logging
 from datetime import datetime
 from typing import List, Dict
 
+logger = logging.getLogger(__name__)
+
 class OutputFormatter:
     def format_output(self, input_documents: List[str], persona: str, 
                      job_to_be_done: str, sections: List[Dict]) -> Dict:
         """Debug version to see what sections are being formatted."""
+        timestamp = datetime.now().isoformat()
         
-        print(f"🔍 Output formatter received {len(sections)} sections")
+        logger.debug("🔍 Output formatter received %d sections", len(sections))
         for i, section in enumerate(sections[:3]):
-            print(f"🔍 Section {i+1}: '{section.get('title', 'NO TITLE')}'")
-        
-        extracted_sections = []
-        subsection_analysis = []
+            logger.debug("🔍 Section %d: '%s'", i + 1, section.get('title', 'NO TITLE'))
         
         # Force create output even if sections are empty
         if not sections:
-            print("🔍 No sections provided - creating placeholder")
+            logger.debug("🔍 No sections provided - creating placeholder")
             extracted_sections = [{
                 "document": "Unknown",
                 "section_title": "No relevant sections found",
                 "importance_rank": 1,
                 "page_number": 1
             }]
+            subsection_analysis = []
         else:
-            for section in sections:
-                extracted_sections.append({
-                    "document": section.get("document_name", "Unknown"),
-                    "section_title": section.get("title", "Untitled"),
-                    "importance_rank": section.get("importance_rank", 0),
-                    "page_number": section.get("page", 1)
-                })
-                
-                # Add subsections
-                for subsection in section.get("subsections", []):
-                    subsection_analysis.append({
-                        "document": section.get("document_name", "Unknown"),
-                        "refined_text": subsection.get("content", ""),
-                        "page_number": section.get("page", 1),
-                        "references": subsection.get("references", []),
-                        "summary": subsection.get("summary", "")
-                    })
+            # Look up document and page once per section, reused by both lists
+            origins = [(section.get("document_name", "Unknown"), section.get("page", 1))
+                       for section in sections]
+            
+            extracted_sections = [{
+                "document": document,
+                "section_title": section.get("title", "Untitled"),
+                "importance_rank": section.get("importance_rank", 0),
+                "page_number": page
+            } for section, (document, page) in zip(sections, origins)]
+            
+            # Flatten subsections of every section in one pass
+            subsection_analysis = [{
+                "document": document,
+                "refined_text": subsection.get("content", ""),
+                "page_number": page,
+                "references": subsection.get("references", []),
+                "summary": subsection.get("summary", "")
+            } for section, (document, page) in zip(sections, origins)
+              for subsection in section.get("subsections", [])]
         
         output = {
             "metadata": {
                 "input_documents": input_documents,
                 "persona": persona,
                 "job_to_be_done": job_to_be_done,
-                "processing_timestamp": datetime.now().isoformat(),
+                "processing_timestamp": timestamp,
                 "total_sections_extracted": len(extracted_sections),
                 "total_subsections_analyzed": len(subsection_analysis)
             },
@@ -55,5 +59,5 @@ class OutputFormatter:
             "subsection_analysis": subsection_analysis
         }
         
-        print(f"🔍 Final output has {len(output['extracted_sections'])} extracted sections")
+        logger.debug("🔍 Final output has %d extracted sections", len(output['extracted_sections']))
         return output
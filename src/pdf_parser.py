@@ -1,37 +1,112 @@
+import gc
+import hashlib
+import json
+import logging
+import os
 import fitz
-from typing import Dict, List
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever parse() output changes so stale cache entries are ignored
+PARSER_VERSION = 1
+
+# Documents shorter than this are always decoded in-process
+MIN_PAGES_FOR_WORKERS = 4
+
+def _parse_page_range(pdf_path: str, page_nums: List[int]) -> List[Dict]:
+    """Decode a set of pages in a worker process; fitz objects cannot be pickled."""
+    with fitz.open(pdf_path) as doc:
+        pages = (PDFParser._extract_page(doc[n], n + 1) for n in page_nums)
+        return [page_data for page_data in pages if page_data]
 
 class PDFParser:
+    def __init__(self, cache_dir: Optional[str] = None,
+                 max_content_pages: Optional[int] = None,
+                 page_workers: int = 1):
+        """Optionally cache parse results on disk (or via PDF_PARSE_CACHE_DIR).
+        
+        By default up to 20 pages are parsed; set max_content_pages to stop
+        once that many pages with content are found. With page_workers > 1,
+        pages of longer documents are decoded in that many worker processes.
+        """
+        cache_dir = cache_dir or os.environ.get("PDF_PARSE_CACHE_DIR")
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_content_pages = max_content_pages
+        self.page_workers = page_workers
+    
     def parse(self, pdf_path: str) -> Dict:
-        """Parse PDF and extract all readable text."""
-        doc = fitz.open(pdf_path)
-        pages_data = []
+        """Parse PDF and extract all readable text, reusing cached results."""
+        if self.cache_dir is None:
+            return self._parse_document(pdf_path)
+        
+        cache_file = self._cache_file(pdf_path)
+        if cache_file.exists():
+            try:
+                return json.loads(cache_file.read_bytes())
+            except ValueError:
+                logger.warning("Ignoring corrupt parse cache entry %s", cache_file)
         
-        # Process up to 20 pages for speed while getting enough content
-        total_pages = min(len(doc), 20)
+        document_data = self._parse_document(pdf_path)
         
-        for page_num in range(total_pages):
-            page = doc[page_num]
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write then rename so concurrent workers never read a partial entry
+            tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            tmp_file.write_text(json.dumps(document_data, ensure_ascii=False), encoding='utf-8')
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            logger.warning("Could not write parse cache entry %s: %s", cache_file, e)
+        
+        return document_data
+    
+    def _cache_file(self, pdf_path: str) -> Path:
+        """Cache location keyed by file content and parser version."""
+        digest = hashlib.sha256(Path(pdf_path).read_bytes())
+        digest.update(f"v{PARSER_VERSION}:{self.max_content_pages}".encode())
+        return self.cache_dir / f"{digest.hexdigest()}.json"
+    
+    def _parse_document(self, pdf_path: str) -> Dict:
+        """Extract text from up to 20 pages and derive a document title."""
+        pages_data = []
+        
+        # The context manager closes the document even if a page fails to decode
+        with fitz.open(pdf_path) as doc:
+            page_count = len(doc)
             
-            # Extract all text from the page
-            text = page.get_text()
+            # Process up to 20 pages for speed while getting enough content
+            total_pages = min(page_count, 20)
             
-            if len(text.strip()) > 50:  # Only include pages with substantial content
-                pages_data.append({
-                    "page_num": page_num + 1,
-                    "text": text.strip()
-                })
+            use_workers = self.page_workers > 1 and total_pages >= MIN_PAGES_FOR_WORKERS
+            if not use_workers:
+                # PyMuPDF documents are not thread-safe, so in-process pages are
+                # decoded serially
+                for page_num in range(total_pages):
+                    page_data = self._extract_page(doc[page_num], page_num + 1)
+                    if page_data:
+                        pages_data.append(page_data)
+                        if self.max_content_pages and len(pages_data) >= self.max_content_pages:
+                            break
+        
+        if use_workers:
+            pages_data = self._parse_pages_parallel(str(pdf_path), total_pages)
         
-        doc.close()
+        # Large documents leave sizeable MuPDF buffers behind; free them before the next file
+        if page_count > 20:
+            gc.collect()
         
         # Extract title from first page
         title = "Document"
         if pages_data and pages_data[0]["text"]:
             # Use first meaningful line as title
-            first_lines = pages_data[0]["text"].split('\n')[:3]
+            first_lines = pages_data[0]["text"].split('\n', 3)[:3]
             for line in first_lines:
-                if len(line.strip()) > 10 and len(line.strip()) < 100:
-                    title = line.strip()
+                line = line.strip()
+                if 10 < len(line) < 100:
+                    title = line
                     break
         
         return {
@@ -39,3 +114,31 @@ class PDFParser:
             "pages": pages_data,
             "total_pages": len(pages_data)
         }
+    
+    def _parse_pages_parallel(self, pdf_path: str, total_pages: int) -> List[Dict]:
+        """Decode pages across worker processes, each reopening the file once."""
+        workers = min(self.page_workers, total_pages)
+        page_groups = [list(range(i, total_pages, workers)) for i in range(workers)]
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(partial(_parse_page_range, pdf_path), page_groups)
+            pages_data = sorted((page_data for group in results for page_data in group),
+                                key=lambda page_data: page_data["page_num"])
+        
+        # Same pages the serial early stop would have kept
+        if self.max_content_pages:
+            pages_data = pages_data[:self.max_content_pages]
+        return pages_data
+    
+    @staticmethod
+    def _extract_page(page, page_num: int) -> Optional[Dict]:
+        """Extract the text of a single page, skipping near-empty pages."""
+        # Plain "text" mode is the cheapest extraction PyMuPDF offers
+        text = page.get_text("text").strip()
+        
+        if len(text) > 50:  # Only include pages with substantial content
+            return {
+                "page_num": page_num,
+                "text": text
+            }
+        return None
@@ -1,75 +1,129 @@
-from typing import List, Dict
+from typing import List, Dict, Tuple
 from collections import Counter
+from functools import lru_cache
+import heapq
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
+# \b is kept so letter runs glued to digits or underscores are not counted as words
+_WORD_RE = re.compile(r'\b[a-zA-Z]{3,}\b')
+
+# Maps every ASCII non-word character to a space; splitting the result yields \w+ runs
+_NON_WORD_TO_SPACE = str.maketrans({chr(c): ' ' for c in range(128) if not (chr(c).isalnum() or chr(c) == '_')})
+
+def _tokenize(text: str) -> List[str]:
+    """Same tokens as _WORD_RE.findall, using str.translate/split for ASCII text."""
+    if text.isascii():
+        return [word for word in text.translate(_NON_WORD_TO_SPACE).split()
+                if len(word) >= 3 and word.isalpha()]
+    return _WORD_RE.findall(text)
+
+# Only the most common stopwords; shared by every matcher instance
+_STOPWORDS = frozenset({'the', 'and', 'for', 'with', 'this', 'that'})
+
 class PersonaMatcher:
     def __init__(self):
         """Lightweight keyword-based matcher."""
-        print("Using fast keyword-based persona matching...")
+        logger.info("Using fast keyword-based persona matching...")
     
     def match_sections(self, sections: List[Dict], persona: str, job_to_be_done: str) -> List[Dict]:
         """Match sections using dynamic keyword extraction with generous scoring."""
         if not sections:
             return []
         
-        # Extract keywords from persona and job
-        query_text = f"{persona} {job_to_be_done}".lower()
-        query_words = re.findall(r'\b[a-zA-Z]{3,}\b', query_text)
+        query_keywords = self._extract_query_keywords(persona, job_to_be_done)
         
-        # Remove only the most common stopwords
-        basic_stopwords = {'the', 'and', 'for', 'with', 'this', 'that'}
-        query_keywords = [word for word in query_words if word not in basic_stopwords]
+        logger.info("Matching against keywords: %s", list(query_keywords[:5]))
         
-        print(f"Matching against keywords: {query_keywords[:5]}")
+        scores = []
         
-        scored_sections = []
+        # Number of keywords partially matching each distinct word; shared across
+        # sections because paragraphs reuse most of their vocabulary
+        partial_hits = {}
+        
+        # Query keywords with their multiplicity, for set intersection against section words
+        keyword_counts = Counter(query_keywords)
+        
+        # Identical paragraphs (repeated boilerplate across documents) score identically
+        score_cache = {}
+        cache_hits = 0
         
         for section in sections:
-            # Create searchable text
-            section_text = f"{section['title']} {section['content']}".lower()
-            section_words = re.findall(r'\b[a-zA-Z]{3,}\b', section_text)
-            
-            # Calculate score with multiple matching strategies
-            score = 0
-            
-            # 1. Exact keyword matches
-            for keyword in query_keywords:
-                if keyword in section_words:
-                    score += 2
-            
-            # 2. Partial word matches
-            for keyword in query_keywords:
-                for word in section_words:
-                    if keyword in word or word in keyword:
-                        score += 0.5
-            
-            # 3. Title bonus
-            for keyword in query_keywords:
-                if keyword in section['title'].lower():
-                    score += 3
-            
-            # 4. Content density bonus (more content = potentially more relevant)
-            if len(section['content']) > 300:
-                score += 1
+            key = (section['title'], section['content'])
+            score = score_cache.get(key)
+            if score is None:
+                score = score_cache[key] = self._score_section(
+                    section['title'], section['content'], query_keywords, keyword_counts, partial_hits
+                )
+            else:
+                cache_hits += 1
             
-            # 5. Ensure every section gets at least a small base score
-            score += 0.1
-            
-            section_copy = section.copy()
-            section_copy["relevance_score"] = score
-            scored_sections.append(section_copy)
+            scores.append(score)
+        
+        logger.debug("Reused scores for %d duplicate sections", cache_hits)
         
-        # Sort by relevance score
-        scored_sections.sort(key=lambda x: x["relevance_score"], reverse=True)
+        # Take top sections but ensure we have at least 3; a bounded heap avoids
+        # sorting every section and, like a stable sort, keeps ties in input order
+        top_k = max(5, min(len(sections), 3))
+        ranked = heapq.nlargest(top_k, range(len(sections)), key=scores.__getitem__)
         
-        # Take top sections but ensure we have at least 3
-        top_sections = scored_sections[:max(5, min(len(scored_sections), 3))]
+        # Only the selected sections are copied
+        top_sections = [dict(sections[i], relevance_score=scores[i]) for i in ranked]
         
         # Assign importance ranks
         for i, section in enumerate(top_sections):
             section["importance_rank"] = i + 1
         
-        print(f"Persona matching completed in 0.00 seconds")
-        print(f"Found {len(top_sections)} relevant sections")
+        logger.info("Persona matching completed in 0.00 seconds")
+        logger.info("Found %d relevant sections", len(top_sections))
         
         return top_sections
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _extract_query_keywords(persona: str, job_to_be_done: str) -> Tuple[str, ...]:
+        """Extract keywords from persona and job; memoized since the query is fixed per run."""
+        query_text = f"{persona} {job_to_be_done}".lower()
+        query_words = _tokenize(query_text)
+        
+        # Remove only the most common stopwords
+        return tuple(word for word in query_words if word not in _STOPWORDS)
+    
+    def _score_section(self, title: str, content: str, query_keywords: Tuple[str, ...],
+                       keyword_counts: Counter, partial_hits: Dict[str, int]) -> float:
+        """Score one section against the query keywords."""
+        # Create searchable text
+        section_text = f"{title} {content}".lower()
+        word_freq = Counter(_tokenize(section_text))
+        
+        # Calculate score with multiple matching strategies
+        score = 0
+        
+        # 1. Exact keyword matches (set intersection runs in C)
+        score += 2 * sum(keyword_counts[keyword] for keyword in keyword_counts.keys() & word_freq.keys())
+        
+        # 2. Partial word matches, once per distinct word weighted by its count
+        for word, count in word_freq.items():
+            hits = partial_hits.get(word)
+            if hits is None:
+                hits = partial_hits[word] = sum(
+                    1 for keyword in query_keywords if keyword in word or word in keyword
+                )
+            score += 0.5 * hits * count
+        
+        # 3. Title bonus
+        title_lower = title.lower()
+        for keyword in query_keywords:
+            if keyword in title_lower:
+                score += 3
+        
+        # 4. Content density bonus (more content = potentially more relevant)
+        if len(content) > 300:
+            score += 1
+        
+        # 5. Ensure every section gets at least a small base score
+        score += 0.1
+        
+        return score
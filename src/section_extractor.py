@@ -1,6 +1,18 @@
+import logging
 import re
 from typing import List, Dict
 
+logger = logging.getLogger(__name__)
+
+_PARA_RE = re.compile(r'\n\s*\n')
+_SENT_RE = re.compile(r'[.!?]+')
+
+# Folds every sentence terminator into '.' so a plain str.split can replace _SENT_RE.split
+_TERMINATORS_TO_PERIOD = str.maketrans('!?', '..')
+
+# Sections kept per document; extraction stops as soon as this many are found
+MAX_SECTIONS = 20
+
 class SectionExtractor:
     def extract_sections(self, document_data: Dict) -> List[Dict]:
         """Extract sections with generous thresholds to ensure content is found."""
@@ -10,20 +22,24 @@ class SectionExtractor:
         sections = []
         
         for page_data in document_data["pages"]:
+            if len(sections) >= MAX_SECTIONS:
+                break
+            
             text = page_data["text"]
             
             # Try multiple splitting methods to ensure we get content
             
             # Method 1: Split by double newlines (paragraphs)
-            paragraphs = re.split(r'\n\s*\n', text)
+            paragraphs = _PARA_RE.split(text)
             
             # Method 2: Split by single newlines if paragraphs are too few
             if len(paragraphs) < 3:
                 paragraphs = text.split('\n')
             
-            # Method 3: Split by sentences if still too few
+            # Method 3: Split by sentences if still too few; the empty pieces
+            # between repeated terminators fall below the length threshold
             if len(paragraphs) < 3:
-                paragraphs = re.split(r'[.!?]+', text)
+                paragraphs = text.translate(_TERMINATORS_TO_PERIOD).split('.')
             
             for para in paragraphs:
                 para = para.strip()
@@ -31,11 +47,11 @@ class SectionExtractor:
                 # Very generous content threshold
                 if len(para) > 30:  # At least 30 characters
                     # Extract title from first line or first few words
-                    lines = para.split('\n')
-                    title = lines[0] if lines[0] else para[:50]
+                    first_line = para.partition('\n')[0]
+                    title = first_line if first_line else para[:50]
                     
                     # Clean title
-                    title = re.sub(r'\s+', ' ', title.strip())[:100]
+                    title = ' '.join(title.split())[:100]
                     
                     sections.append({
                         "title": title,
@@ -43,6 +59,9 @@ class SectionExtractor:
                         "content": para[:800],  # Keep substantial content
                         "subsections": self._create_simple_subsections(para)
                     })
+                    
+                    if len(sections) >= MAX_SECTIONS:
+                        break
         
         # Ensure we have at least some sections
         if not sections and document_data["pages"]:
@@ -56,17 +75,16 @@ class SectionExtractor:
                         "subsections": []
                     })
         
-        print(f"Extracted {len(sections)} sections from document")
-        return sections[:20]  # Return up to 20 sections
+        logger.debug("Extracted %d sections from document", len(sections))
+        return sections[:MAX_SECTIONS]
     
     def _create_simple_subsections(self, content: str) -> List[Dict]:
         """Create simple subsections if content is long enough."""
         if len(content) < 200:
             return []
         
-        # Split into sentences
-        sentences = re.split(r'[.!?]+', content)
-        sentences = [s.strip() for s in sentences if len(s.strip()) > 20]
+        # Split into sentences, stripping each fragment once
+        sentences = [s for s in map(str.strip, _SENT_RE.split(content)) if len(s) > 20]
         
         if len(sentences) <= 2:
             return []